@@ -1,5 +1,10 @@
 from . import layers
 
 custom_objects = {
+    'AddRelu': layers.AddRelu,
     'BatchNormalization': layers.BatchNormalization,
+    'ConvBnRelu1D': layers.ConvBnRelu1D,
+    'Crop': layers.Crop,
+    'FusedBatchNormalization': layers.FusedBatchNormalization,
+    'QuantizedResidual': layers.QuantizedResidual,
 }
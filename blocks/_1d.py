@@ -7,13 +7,33 @@ keras_resnet.blocks._1d
 This module implements a number of popular one-dimensional residual blocks.
 """
 
+import types
+import warnings
+
 import keras.layers
 import keras.regularizers
 
 from .. import layers
 
-parameters = {
-    "kernel_initializer": "he_normal"
+_CONV_KW = types.MappingProxyType({
+    "kernel_initializer": "he_normal",
+    "use_bias": False
+})
+
+_names = {
+    "res_branch2a_depthwise": "res{}{}_branch2a_depthwise",
+    "res_branch2a": "res{}{}_branch2a",
+    "bn_branch2a": "bn{}{}_branch2a",
+    "relu_branch2a": "res{}{}_branch2a_relu",
+    "res_branch2b_depthwise": "res{}{}_branch2b_depthwise",
+    "res_branch2b": "res{}{}_branch2b",
+    "bn_branch2b": "bn{}{}_branch2b",
+    "relu_branch2b": "res{}{}_branch2b_relu",
+    "res_branch2c": "res{}{}_branch2c",
+    "bn_branch2c": "bn{}{}_branch2c",
+    "res_branch1": "res{}{}_branch1",
+    "bn_branch1": "bn{}{}_branch1",
+    "relu": "res{}{}_relu"
 }
 
 
@@ -24,12 +44,16 @@ def basic_1d(
     kernel_size=3,
     numerical_name=False,
     stride=None,
-    freeze_bn=False
+    freeze_bn=False,
+    identity_shortcut=False,
+    separable=False,
+    named_layers=True,
+    quantize_residuals=False
 ):
     """
     A one-dimensional basic block.
 
-    :param filters: the output’s feature space
+    :param filters: the output’s feature space (a multiple of 8 for Tensor Core kernels)
 
     :param stage: int representing the stage of this block (starting from 0)
 
@@ -43,6 +67,14 @@ def basic_1d(
 
     :param freeze_bn: if true, freezes BatchNormalization layers (ie. no updates are done in these layers)
 
+    :param identity_shortcut: if true, the first block uses an identity shortcut instead of a projection when the stride is 1 and the input already has the output’s feature space (not compatible with weights trained with a projection)
+
+    :param separable: if true, replaces each kernel_size convolution with a depthwise convolution followed by a 1x1 convolution (fewer FLOPs, not compatible with weights trained without it)
+
+    :param named_layers: if false, leaves layer naming to Keras (faster to build, but weights can’t be loaded by name)
+
+    :param quantize_residuals: if true, fake quantizes the inputs and the output of the residual addition with a shared symmetric range (explicit Q/DQ for INT8 exporters such as TensorRT, see `keras_resnet.models.ResNet1D.calibrate_residuals`)
+
     Usage:
 
         >>> import keras_resnet.blocks
@@ -55,10 +87,13 @@ def basic_1d(
         else:
             stride = 2
 
-    if keras.backend.image_data_format() == "channels_last":
-        axis = -1
-    else:
-        axis = 1
+    # Tensor Core kernels require channel counts that are multiples of 8
+    if filters % 8 != 0:
+        warnings.warn("{} filters is not a multiple of 8, Tensor Core kernels won’t be used".format(filters))
+
+    assert keras.backend.image_data_format() == "channels_last"
+
+    axis = -1
 
     if block > 0 and numerical_name:
         block_char = "b{}".format(block)
@@ -67,80 +102,108 @@ def basic_1d(
 
     stage_char = str(stage + 2)
 
+    if named_layers:
+        names = {key: name.format(stage_char, block_char) for key, name in _names.items()}
+    else:
+        names = dict.fromkeys(_names)
+
+    if freeze_bn:
+        batch_normalization = layers.FusedBatchNormalization
+    else:
+        batch_normalization = layers.BatchNormalization
+
+    # a separable convolution moves the kernel and the stride into the depthwise convolution
+    if separable:
+        conv_kernel_size, conv_stride = 1, 1
+    else:
+        conv_kernel_size, conv_stride = kernel_size, stride
+
     def f(x):
-        y = keras.layers.ZeroPadding1D(
-            padding=1, 
-            name="padding{}{}_branch2a".format(stage_char, block_char)
-        )(x)
-        
+        y = x
+
+        if separable:
+            y = keras.layers.DepthwiseConv1D(
+                kernel_size,
+                strides=stride,
+                padding="same",
+                use_bias=False,
+                depthwise_initializer="he_normal",
+                name=names["res_branch2a_depthwise"]
+            )(y)
+
         y = keras.layers.Conv1D(
             filters,
-            kernel_size,
-            strides=stride,
-            use_bias=False,
-            name="res{}{}_branch2a".format(stage_char, block_char),
-            **parameters
+            conv_kernel_size,
+            strides=conv_stride,
+            padding="same",
+            name=names["res_branch2a"],
+            **_CONV_KW
         )(y)
-        
-        y = layers.BatchNormalization(
+
+        y = batch_normalization(
             axis=axis,
             epsilon=1e-5,
             freeze=freeze_bn,
-            name="bn{}{}_branch2a".format(stage_char, block_char)
+            name=names["bn_branch2a"]
         )(y)
-        
+
         y = keras.layers.Activation(
             "relu",
-            name="res{}{}_branch2a_relu".format(stage_char, block_char)
+            name=names["relu_branch2a"]
         )(y)
 
-        y = keras.layers.ZeroPadding1D(
-            padding=1,
-            name="padding{}{}_branch2b".format(stage_char, block_char)
-        )(y)
-        
+        if separable:
+            y = keras.layers.DepthwiseConv1D(
+                kernel_size,
+                padding="same",
+                use_bias=False,
+                depthwise_initializer="he_normal",
+                name=names["res_branch2b_depthwise"]
+            )(y)
+
         y = keras.layers.Conv1D(
             filters,
-            kernel_size,
-            use_bias=False,
-            name="res{}{}_branch2b".format(stage_char, block_char),
-            **parameters
+            conv_kernel_size,
+            padding="same",
+            name=names["res_branch2b"],
+            **_CONV_KW
         )(y)
         
-        y = layers.BatchNormalization(
+        y = batch_normalization(
             axis=axis,
             epsilon=1e-5,
             freeze=freeze_bn,
-            name="bn{}{}_branch2b".format(stage_char, block_char)
+            name=names["bn_branch2b"]
         )(y)
 
-        if block == 0:
+        identity = identity_shortcut and stride == 1 and keras.backend.int_shape(x)[axis] == filters
+
+        if block == 0 and not identity:
             shortcut = keras.layers.Conv1D(
                 filters,
                 1,
                 strides=stride,
-                use_bias=False,
-                name="res{}{}_branch1".format(stage_char, block_char),
-                **parameters
+                name=names["res_branch1"],
+                **_CONV_KW
             )(x)
 
-            shortcut = layers.BatchNormalization(
+            shortcut = batch_normalization(
                 axis=axis,
                 epsilon=1e-5,
                 freeze=freeze_bn,
-                name="bn{}{}_branch1".format(stage_char, block_char)
+                name=names["bn_branch1"]
             )(shortcut)
         else:
             shortcut = x
 
-        y = keras.layers.Add(
-            name="res{}{}".format(stage_char, block_char)
-        )([y, shortcut])
-        
-        y = keras.layers.Activation(
-            "relu",
-            name="res{}{}_relu".format(stage_char, block_char)
-        )(y)
+        if quantize_residuals:
+            y = layers.QuantizedResidual(
+                name=names["relu"]
+            )([y, shortcut])
+        else:
+            y = layers.AddRelu(
+                name=names["relu"]
+            )([y, shortcut])
 
         return y
 
@@ -154,12 +217,16 @@ def bottleneck_1d(
     kernel_size=3,
     numerical_name=False,
     stride=None,
-    freeze_bn=False
+    freeze_bn=False,
+    identity_shortcut=False,
+    separable=False,
+    named_layers=True,
+    quantize_residuals=False
 ):
     """
     A one-dimensional bottleneck block.
 
-    :param filters: the output’s feature space
+    :param filters: the output’s feature space (a multiple of 8 for Tensor Core kernels)
 
     :param stage: int representing the stage of this block (starting from 0)
 
@@ -173,6 +240,14 @@ def bottleneck_1d(
 
     :param freeze_bn: if true, freezes BatchNormalization layers (ie. no updates are done in these layers)
 
+    :param identity_shortcut: if true, the first block uses an identity shortcut instead of a projection when the stride is 1 and the input already has the output’s feature space (not compatible with weights trained with a projection)
+
+    :param separable: if true, replaces each kernel_size convolution with a depthwise convolution followed by a 1x1 convolution (fewer FLOPs, not compatible with weights trained without it)
+
+    :param named_layers: if false, leaves layer naming to Keras (faster to build, but weights can’t be loaded by name)
+
+    :param quantize_residuals: if true, fake quantizes the inputs and the output of the residual addition with a shared symmetric range (explicit Q/DQ for INT8 exporters such as TensorRT, see `keras_resnet.models.ResNet1D.calibrate_residuals`)
+
     Usage:
 
         >>> import keras_resnet.blocks
@@ -182,10 +257,13 @@ def bottleneck_1d(
     if stride is None:
         stride = 1 if block != 0 or stage == 0 else 2
 
-    if keras.backend.image_data_format() == "channels_last":
-        axis = -1
-    else:
-        axis = 1
+    # Tensor Core kernels require channel counts that are multiples of 8
+    if filters % 8 != 0:
+        warnings.warn("{} filters is not a multiple of 8, Tensor Core kernels won’t be used".format(filters))
+
+    assert keras.backend.image_data_format() == "channels_last"
+
+    axis = -1
 
     if block > 0 and numerical_name:
         block_char = "b{}".format(block)
@@ -194,95 +272,111 @@ def bottleneck_1d(
 
     stage_char = str(stage + 2)
 
+    if named_layers:
+        names = {key: name.format(stage_char, block_char) for key, name in _names.items()}
+    else:
+        names = dict.fromkeys(_names)
+
+    if freeze_bn:
+        batch_normalization = layers.FusedBatchNormalization
+    else:
+        batch_normalization = layers.BatchNormalization
+
+    # a separable convolution moves the kernel into the depthwise convolution
+    conv_kernel_size = 1 if separable else kernel_size
+
     def f(x):
         y = keras.layers.Conv1D(
             filters,
             1,
             strides=stride,
-            use_bias=False,
-            name="res{}{}_branch2a".format(stage_char, block_char),
-            **parameters
+            name=names["res_branch2a"],
+            **_CONV_KW
         )(x)
 
-        y = layers.BatchNormalization(
+        y = batch_normalization(
             axis=axis,
             epsilon=1e-5,
             freeze=freeze_bn,
-            name="bn{}{}_branch2a".format(stage_char, block_char)
+            name=names["bn_branch2a"]
         )(y)
 
         y = keras.layers.Activation(
             "relu",
-            name="res{}{}_branch2a_relu".format(stage_char, block_char)
+            name=names["relu_branch2a"]
         )(y)
 
-        y = keras.layers.ZeroPadding1D(
-            padding=1,
-            name="padding{}{}_branch2b".format(stage_char, block_char)
-        )(y)
+        if separable:
+            y = keras.layers.DepthwiseConv1D(
+                kernel_size,
+                padding="same",
+                use_bias=False,
+                depthwise_initializer="he_normal",
+                name=names["res_branch2b_depthwise"]
+            )(y)
 
         y = keras.layers.Conv1D(
             filters,
-            kernel_size,
-            use_bias=False,
-            name="res{}{}_branch2b".format(stage_char, block_char),
-            **parameters
+            conv_kernel_size,
+            padding="same",
+            name=names["res_branch2b"],
+            **_CONV_KW
         )(y)
 
-        y = layers.BatchNormalization(
+        y = batch_normalization(
             axis=axis,
             epsilon=1e-5,
             freeze=freeze_bn,
-            name="bn{}{}_branch2b".format(stage_char, block_char)
+            name=names["bn_branch2b"]
         )(y)
 
         y = keras.layers.Activation(
             "relu",
-            name="res{}{}_branch2b_relu".format(stage_char, block_char)
+            name=names["relu_branch2b"]
         )(y)
 
         y = keras.layers.Conv1D(
             filters * 4,
             1,
-            use_bias=False,
-            name="res{}{}_branch2c".format(stage_char, block_char),
-            **parameters
+            name=names["res_branch2c"],
+            **_CONV_KW
         )(y)
 
-        y = layers.BatchNormalization(
+        y = batch_normalization(
             axis=axis,
             epsilon=1e-5,
             freeze=freeze_bn,
-            name="bn{}{}_branch2c".format(stage_char, block_char)
+            name=names["bn_branch2c"]
         )(y)
 
-        if block == 0:
+        identity = identity_shortcut and stride == 1 and keras.backend.int_shape(x)[axis] == filters * 4
+
+        if block == 0 and not identity:
             shortcut = keras.layers.Conv1D(
                 filters * 4,
                 1,
                 strides=stride,
-                use_bias=False,
-                name="res{}{}_branch1".format(stage_char, block_char),
-                **parameters
+                name=names["res_branch1"],
+                **_CONV_KW
             )(x)
 
-            shortcut = layers.BatchNormalization(
+            shortcut = batch_normalization(
                 axis=axis,
                 epsilon=1e-5,
                 freeze=freeze_bn,
-                name="bn{}{}_branch1".format(stage_char, block_char)
+                name=names["bn_branch1"]
             )(shortcut)
         else:
             shortcut = x
 
-        y = keras.layers.Add(
-            name="res{}{}".format(stage_char, block_char)
-        )([y, shortcut])
-
-        y = keras.layers.Activation(
-            "relu",
-            name="res{}{}_relu".format(stage_char, block_char)
-        )(y)
+        if quantize_residuals:
+            y = layers.QuantizedResidual(
+                name=names["relu"]
+            )([y, shortcut])
+        else:
+            y = layers.AddRelu(
+                name=names["relu"]
+            )([y, shortcut])
 
         return y
 
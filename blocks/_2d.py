@@ -7,13 +7,35 @@ keras_resnet.blocks._2d
 This module implements a number of popular two-dimensional residual blocks.
 """
 
+import types
+
 import keras.layers
 import keras.regularizers
 
 from .. import layers
 
-parameters = {
-    "kernel_initializer": "he_normal"
+_CONV_KW = types.MappingProxyType({
+    "kernel_initializer": "he_normal",
+    "use_bias": False
+})
+
+_names = {
+    "padding_branch2a": "padding{}{}_branch2a",
+    "padding_branch2b": "padding{}{}_branch2b",
+    "res_branch2a_depthwise": "res{}{}_branch2a_depthwise",
+    "res_branch2a": "res{}{}_branch2a",
+    "bn_branch2a": "bn{}{}_branch2a",
+    "relu_branch2a": "res{}{}_branch2a_relu",
+    "res_branch2b_depthwise": "res{}{}_branch2b_depthwise",
+    "res_branch2b": "res{}{}_branch2b",
+    "bn_branch2b": "bn{}{}_branch2b",
+    "relu_branch2b": "res{}{}_branch2b_relu",
+    "res_branch2c": "res{}{}_branch2c",
+    "bn_branch2c": "bn{}{}_branch2c",
+    "res_branch1": "res{}{}_branch1",
+    "bn_branch1": "bn{}{}_branch1",
+    "res": "res{}{}",
+    "relu": "res{}{}_relu"
 }
 
 
@@ -24,7 +46,10 @@ def basic_2d(
     kernel_size=3,
     numerical_name=False,
     stride=None,
-    freeze_bn=False
+    freeze_bn=False,
+    identity_shortcut=False,
+    separable=False,
+    named_layers=True
 ):
     """
     A two-dimensional basic block.
@@ -43,6 +68,12 @@ def basic_2d(
 
     :param freeze_bn: if true, freezes BatchNormalization layers (ie. no updates are done in these layers)
 
+    :param identity_shortcut: if true, the first block uses an identity shortcut instead of a projection when the stride is 1 and the input already has the output’s feature space (not compatible with weights trained with a projection)
+
+    :param separable: if true, replaces each kernel_size convolution with a depthwise convolution followed by a 1x1 convolution (fewer FLOPs, not compatible with weights trained without it)
+
+    :param named_layers: if false, leaves layer naming to Keras (faster to build, but weights can’t be loaded by name)
+
     Usage:
 
         >>> import keras_resnet.blocks
@@ -55,10 +86,9 @@ def basic_2d(
         else:
             stride = 2
 
-    if keras.backend.image_data_format() == "channels_last":
-        axis = 3
-    else:
-        axis = 1
+    assert keras.backend.image_data_format() == "channels_last"
+
+    axis = -1
 
     if block > 0 and numerical_name:
         block_char = "b{}".format(block)
@@ -67,31 +97,53 @@ def basic_2d(
 
     stage_char = str(stage + 2)
 
+    if named_layers:
+        names = {key: name.format(stage_char, block_char) for key, name in _names.items()}
+    else:
+        names = dict.fromkeys(_names)
+
+    if freeze_bn:
+        batch_normalization = layers.FusedBatchNormalization
+    else:
+        batch_normalization = layers.BatchNormalization
+
     def f(x):
-        y = keras.layers.ZeroPadding2D(padding=1, name="padding{}{}_branch2a".format(stage_char, block_char))(x)
+        if separable:
+            y = keras.layers.DepthwiseConv2D(kernel_size, strides=stride, padding="same", use_bias=False, depthwise_initializer="he_normal", name=names["res_branch2a_depthwise"])(x)
 
-        y = keras.layers.Conv2D(filters, kernel_size, strides=stride, use_bias=False, name="res{}{}_branch2a".format(stage_char, block_char), **parameters)(y)
+            y = keras.layers.Conv2D(filters, (1, 1), name=names["res_branch2a"], **_CONV_KW)(y)
+        else:
+            y = keras.layers.ZeroPadding2D(padding=1, name=names["padding_branch2a"])(x)
 
-        y = layers.BatchNormalization(axis=axis, epsilon=1e-5, freeze=freeze_bn, name="bn{}{}_branch2a".format(stage_char, block_char))(y)
+            y = keras.layers.Conv2D(filters, kernel_size, strides=stride, name=names["res_branch2a"], **_CONV_KW)(y)
 
-        y = keras.layers.Activation("relu", name="res{}{}_branch2a_relu".format(stage_char, block_char))(y)
+        y = batch_normalization(axis=axis, epsilon=1e-5, freeze=freeze_bn, name=names["bn_branch2a"])(y)
 
-        y = keras.layers.ZeroPadding2D(padding=1, name="padding{}{}_branch2b".format(stage_char, block_char))(y)
+        y = keras.layers.Activation("relu", name=names["relu_branch2a"])(y)
+
+        if separable:
+            y = keras.layers.DepthwiseConv2D(kernel_size, padding="same", use_bias=False, depthwise_initializer="he_normal", name=names["res_branch2b_depthwise"])(y)
+
+            y = keras.layers.Conv2D(filters, (1, 1), name=names["res_branch2b"], **_CONV_KW)(y)
+        else:
+            y = keras.layers.ZeroPadding2D(padding=1, name=names["padding_branch2b"])(y)
 
-        y = keras.layers.Conv2D(filters, kernel_size, use_bias=False, name="res{}{}_branch2b".format(stage_char, block_char), **parameters)(y)
+            y = keras.layers.Conv2D(filters, kernel_size, name=names["res_branch2b"], **_CONV_KW)(y)
 
-        y = layers.BatchNormalization(axis=axis, epsilon=1e-5, freeze=freeze_bn, name="bn{}{}_branch2b".format(stage_char, block_char))(y)
+        y = batch_normalization(axis=axis, epsilon=1e-5, freeze=freeze_bn, name=names["bn_branch2b"])(y)
 
-        if block == 0:
-            shortcut = keras.layers.Conv2D(filters, (1, 1), strides=stride, use_bias=False, name="res{}{}_branch1".format(stage_char, block_char), **parameters)(x)
+        identity = identity_shortcut and stride == 1 and keras.backend.int_shape(x)[axis] == filters
 
-            shortcut = layers.BatchNormalization(axis=axis, epsilon=1e-5, freeze=freeze_bn, name="bn{}{}_branch1".format(stage_char, block_char))(shortcut)
+        if block == 0 and not identity:
+            shortcut = keras.layers.Conv2D(filters, (1, 1), strides=stride, name=names["res_branch1"], **_CONV_KW)(x)
+
+            shortcut = batch_normalization(axis=axis, epsilon=1e-5, freeze=freeze_bn, name=names["bn_branch1"])(shortcut)
         else:
             shortcut = x
 
-        y = keras.layers.Add(name="res{}{}".format(stage_char, block_char))([y, shortcut])
+        y = keras.layers.Add(name=names["res"])([y, shortcut])
 
-        y = keras.layers.Activation("relu", name="res{}{}_relu".format(stage_char, block_char))(y)
+        y = keras.layers.Activation("relu", name=names["relu"])(y)
 
         return y
 
@@ -105,7 +157,10 @@ def bottleneck_2d(
     kernel_size=3,
     numerical_name=False,
     stride=None,
-    freeze_bn=False
+    freeze_bn=False,
+    identity_shortcut=False,
+    separable=False,
+    named_layers=True
 ):
     """
     A two-dimensional bottleneck block.
@@ -124,6 +179,12 @@ def bottleneck_2d(
 
     :param freeze_bn: if true, freezes BatchNormalization layers (ie. no updates are done in these layers)
 
+    :param identity_shortcut: if true, the first block uses an identity shortcut instead of a projection when the stride is 1 and the input already has the output’s feature space (not compatible with weights trained with a projection)
+
+    :param separable: if true, replaces each kernel_size convolution with a depthwise convolution followed by a 1x1 convolution (fewer FLOPs, not compatible with weights trained without it)
+
+    :param named_layers: if false, leaves layer naming to Keras (faster to build, but weights can’t be loaded by name)
+
     Usage:
 
         >>> import keras_resnet.blocks
@@ -136,10 +197,9 @@ def bottleneck_2d(
         else:
             stride = 2
 
-    if keras.backend.image_data_format() == "channels_last":
-        axis = 3
-    else:
-        axis = 1
+    assert keras.backend.image_data_format() == "channels_last"
+
+    axis = -1
 
     if block > 0 and numerical_name:
         block_char = "b{}".format(block)
@@ -148,35 +208,52 @@ def bottleneck_2d(
 
     stage_char = str(stage + 2)
 
+    if named_layers:
+        names = {key: name.format(stage_char, block_char) for key, name in _names.items()}
+    else:
+        names = dict.fromkeys(_names)
+
+    if freeze_bn:
+        batch_normalization = layers.FusedBatchNormalization
+    else:
+        batch_normalization = layers.BatchNormalization
+
     def f(x):
-        y = keras.layers.Conv2D(filters, (1, 1), strides=stride, use_bias=False, name="res{}{}_branch2a".format(stage_char, block_char), **parameters)(x)
+        y = keras.layers.Conv2D(filters, (1, 1), strides=stride, name=names["res_branch2a"], **_CONV_KW)(x)
 
-        y = layers.BatchNormalization(axis=axis, epsilon=1e-5, freeze=freeze_bn, name="bn{}{}_branch2a".format(stage_char, block_char))(y)
+        y = batch_normalization(axis=axis, epsilon=1e-5, freeze=freeze_bn, name=names["bn_branch2a"])(y)
 
-        y = keras.layers.Activation("relu", name="res{}{}_branch2a_relu".format(stage_char, block_char))(y)
+        y = keras.layers.Activation("relu", name=names["relu_branch2a"])(y)
+
+        if separable:
+            y = keras.layers.DepthwiseConv2D(kernel_size, padding="same", use_bias=False, depthwise_initializer="he_normal", name=names["res_branch2b_depthwise"])(y)
+
+            y = keras.layers.Conv2D(filters, (1, 1), name=names["res_branch2b"], **_CONV_KW)(y)
+        else:
+            y = keras.layers.ZeroPadding2D(padding=1, name=names["padding_branch2b"])(y)
 
-        y = keras.layers.ZeroPadding2D(padding=1, name="padding{}{}_branch2b".format(stage_char, block_char))(y)
+            y = keras.layers.Conv2D(filters, kernel_size, name=names["res_branch2b"], **_CONV_KW)(y)
 
-        y = keras.layers.Conv2D(filters, kernel_size, use_bias=False, name="res{}{}_branch2b".format(stage_char, block_char), **parameters)(y)
+        y = batch_normalization(axis=axis, epsilon=1e-5, freeze=freeze_bn, name=names["bn_branch2b"])(y)
 
-        y = layers.BatchNormalization(axis=axis, epsilon=1e-5, freeze=freeze_bn, name="bn{}{}_branch2b".format(stage_char, block_char))(y)
+        y = keras.layers.Activation("relu", name=names["relu_branch2b"])(y)
 
-        y = keras.layers.Activation("relu", name="res{}{}_branch2b_relu".format(stage_char, block_char))(y)
+        y = keras.layers.Conv2D(filters * 4, (1, 1), name=names["res_branch2c"], **_CONV_KW)(y)
 
-        y = keras.layers.Conv2D(filters * 4, (1, 1), use_bias=False, name="res{}{}_branch2c".format(stage_char, block_char), **parameters)(y)
+        y = batch_normalization(axis=axis, epsilon=1e-5, freeze=freeze_bn, name=names["bn_branch2c"])(y)
 
-        y = layers.BatchNormalization(axis=axis, epsilon=1e-5, freeze=freeze_bn, name="bn{}{}_branch2c".format(stage_char, block_char))(y)
+        identity = identity_shortcut and stride == 1 and keras.backend.int_shape(x)[axis] == filters * 4
 
-        if block == 0:
-            shortcut = keras.layers.Conv2D(filters * 4, (1, 1), strides=stride, use_bias=False, name="res{}{}_branch1".format(stage_char, block_char), **parameters)(x)
+        if block == 0 and not identity:
+            shortcut = keras.layers.Conv2D(filters * 4, (1, 1), strides=stride, name=names["res_branch1"], **_CONV_KW)(x)
 
-            shortcut = layers.BatchNormalization(axis=axis, epsilon=1e-5, freeze=freeze_bn, name="bn{}{}_branch1".format(stage_char, block_char))(shortcut)
+            shortcut = batch_normalization(axis=axis, epsilon=1e-5, freeze=freeze_bn, name=names["bn_branch1"])(shortcut)
         else:
             shortcut = x
 
-        y = keras.layers.Add(name="res{}{}".format(stage_char, block_char))([y, shortcut])
+        y = keras.layers.Add(name=names["res"])([y, shortcut])
 
-        y = keras.layers.Activation("relu", name="res{}{}_relu".format(stage_char, block_char))(y)
+        y = keras.layers.Activation("relu", name=names["relu"])(y)
 
         return y
 
@@ -1 +1,6 @@
+from ._add_relu import AddRelu
 from ._batch_normalization import BatchNormalization
+from ._fused_batch_normalization import FusedBatchNormalization
+from ._conv_bn_relu import ConvBnRelu1D
+from ._crop import Crop
+from ._quantized_residual import QuantizedResidual
@@ -0,0 +1,16 @@
+import keras.layers
+import tensorflow
+
+
+class AddRelu(keras.layers.Layer):
+    """
+    Adds a residual branch to its shortcut and applies a ReLU, as one elementwise operation for XLA to fuse.
+    """
+
+    def call(self, inputs, *args, **kwargs):
+        y, shortcut = inputs
+
+        return tensorflow.nn.relu(y + shortcut)
+
+    def compute_output_shape(self, input_shape):
+        return input_shape[0]
@@ -0,0 +1,141 @@
+import keras.backend
+import keras.initializers
+import keras.layers
+import numpy
+import tensorflow
+
+
+class ConvBnRelu1D(keras.layers.Layer):
+    """
+    A one-dimensional convolution folded with the frozen BatchNormalization following it and a ReLU.
+
+    The normalization statistics are folded into the convolution’s kernel and bias once, when the layer is constructed
+    from a trained pair (see `from_layers`), so only a convolution, a bias add and a ReLU remain in the graph.
+
+    The residual blocks keep separate Conv1D and BatchNormalization layers so existing weights still load, use
+    `keras_resnet.models.ResNet1D.fold_batch_normalization` to fold every pair of a trained model when exporting it.
+    """
+
+    def __init__(
+        self,
+        filters,
+        kernel_size,
+        strides=1,
+        padding="same",
+        kernel_initializer="he_normal",
+        bias_initializer="zeros",
+        *args,
+        **kwargs
+    ):
+        self.filters = filters
+        self.kernel_size = kernel_size
+        self.strides = strides
+        self.padding = padding
+        self.kernel_initializer = keras.initializers.get(kernel_initializer)
+        self.bias_initializer = keras.initializers.get(bias_initializer)
+
+        super(ConvBnRelu1D, self).__init__(*args, **kwargs)
+
+    @classmethod
+    def from_layers(cls, convolution, batch_normalization, name=None):
+        """
+        Constructs a layer from a built `keras.layers.Conv1D` (without bias) and the BatchNormalization following it.
+
+        :param convolution: a built, channels_last `keras.layers.Conv1D` layer with `use_bias=False`, "same" or "valid" padding and no dilation
+
+        :param batch_normalization: a built BatchNormalization layer normalizing the convolution’s output
+
+        :param name: name of the new layer, defaults to the convolution’s name
+
+        :return layer: a built `ConvBnRelu1D` layer holding the folded kernel and bias
+
+        Usage:
+
+            >>> import keras_resnet.layers
+
+            >>> layer = keras_resnet.layers.ConvBnRelu1D.from_layers(model.get_layer("res2a_branch2a"), model.get_layer("bn2a_branch2a"))
+        """
+        assert not convolution.use_bias
+        assert convolution.padding in ("same", "valid")
+        assert tuple(convolution.dilation_rate) == (1,)
+        assert convolution.data_format == "channels_last"
+
+        kernel = keras.backend.get_value(convolution.kernel)
+
+        moving_mean = keras.backend.get_value(batch_normalization.moving_mean)
+        moving_variance = keras.backend.get_value(batch_normalization.moving_variance)
+
+        if batch_normalization.scale:
+            gamma = keras.backend.get_value(batch_normalization.gamma)
+        else:
+            gamma = numpy.ones_like(moving_mean)
+
+        if batch_normalization.center:
+            beta = keras.backend.get_value(batch_normalization.beta)
+        else:
+            beta = numpy.zeros_like(moving_mean)
+
+        scale = gamma / numpy.sqrt(moving_variance + batch_normalization.epsilon)
+
+        layer = cls(
+            convolution.filters,
+            convolution.kernel_size[0],
+            strides=convolution.strides[0],
+            padding=convolution.padding,
+            name=name or convolution.name
+        )
+
+        layer.build((None, None, kernel.shape[1]))
+
+        layer.set_weights([kernel * scale, beta - moving_mean * scale])
+
+        return layer
+
+    def build(self, input_shape):
+        channels = input_shape[-1]
+
+        self.kernel = self.add_weight(
+            name="kernel",
+            shape=(self.kernel_size, channels, self.filters),
+            initializer=self.kernel_initializer
+        )
+
+        self.bias = self.add_weight(
+            name="bias",
+            shape=(self.filters,),
+            initializer=self.bias_initializer
+        )
+
+        super(ConvBnRelu1D, self).build(input_shape)
+
+    def call(self, inputs, *args, **kwargs):
+        outputs = tensorflow.nn.conv1d(inputs, self.kernel, stride=self.strides, padding=self.padding.upper())
+
+        outputs = tensorflow.nn.bias_add(outputs, self.bias)
+
+        return tensorflow.nn.relu(outputs)
+
+    def compute_output_shape(self, input_shape):
+        batch_size, length, _ = input_shape
+
+        if length is not None:
+            if self.padding == "same":
+                length = (length + self.strides - 1) // self.strides
+            else:
+                length = (length - self.kernel_size) // self.strides + 1
+
+        return batch_size, length, self.filters
+
+    def get_config(self):
+        config = super(ConvBnRelu1D, self).get_config()
+
+        config.update({
+            "filters": self.filters,
+            "kernel_size": self.kernel_size,
+            "strides": self.strides,
+            "padding": self.padding,
+            "kernel_initializer": keras.initializers.serialize(self.kernel_initializer),
+            "bias_initializer": keras.initializers.serialize(self.bias_initializer)
+        })
+
+        return config
@@ -0,0 +1,25 @@
+import keras.layers
+
+
+class Crop(keras.layers.Layer):
+    """
+    Keeps the first `size` features of the last axis, e.g. to drop the padding logits of a padded classification layer.
+    """
+
+    def __init__(self, size, *args, **kwargs):
+        self.size = size
+
+        super(Crop, self).__init__(*args, **kwargs)
+
+    def call(self, inputs, *args, **kwargs):
+        return inputs[..., :self.size]
+
+    def compute_output_shape(self, input_shape):
+        return tuple(input_shape[:-1]) + (self.size,)
+
+    def get_config(self):
+        config = super(Crop, self).get_config()
+
+        config.update({"size": self.size})
+
+        return config
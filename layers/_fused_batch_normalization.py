@@ -0,0 +1,62 @@
+import keras.backend
+import tensorflow
+
+from ._batch_normalization import BatchNormalization
+
+
+class FusedBatchNormalization(BatchNormalization):
+    """
+    Frozen BatchNormalization computed by a single fused inference kernel.
+
+    The layer stores the same weights as `BatchNormalization`, so weights can be loaded into either, but it always runs in
+    inference mode and evaluates the normalization with `tensorflow.compat.v1.nn.fused_batch_norm` instead of a chain of
+    elementwise operations.
+    """
+
+    def __init__(self, *args, **kwargs):
+        kwargs["freeze"] = True
+        super(FusedBatchNormalization, self).__init__(*args, **kwargs)
+
+    def call(self, inputs, *args, **kwargs):
+        rank = len(keras.backend.int_shape(inputs))
+
+        axis = self.axis[0] if isinstance(self.axis, (list, tuple)) else self.axis
+
+        if axis < 0:
+            axis += rank
+
+        channels_last = axis == rank - 1
+
+        # the fused kernel is only defined for NHWC or NCHW tensors
+        if rank not in (3, 4) or not (channels_last or axis == 1):
+            return super(FusedBatchNormalization, self).call(inputs, *args, **kwargs)
+
+        # lift 3D tensors by an extra spatial dimension
+        if rank == 3:
+            inputs = tensorflow.expand_dims(inputs, 1 if channels_last else 2)
+
+        if self.scale:
+            gamma = self.gamma
+        else:
+            gamma = tensorflow.ones_like(self.moving_mean)
+
+        if self.center:
+            beta = self.beta
+        else:
+            beta = tensorflow.zeros_like(self.moving_mean)
+
+        outputs, _, _ = tensorflow.compat.v1.nn.fused_batch_norm(
+            inputs,
+            tensorflow.cast(gamma, "float32"),
+            tensorflow.cast(beta, "float32"),
+            mean=tensorflow.cast(self.moving_mean, "float32"),
+            variance=tensorflow.cast(self.moving_variance, "float32"),
+            epsilon=self.epsilon,
+            data_format="NHWC" if channels_last else "NCHW",
+            is_training=False
+        )
+
+        if rank == 3:
+            outputs = tensorflow.squeeze(outputs, 1 if channels_last else 2)
+
+        return outputs
@@ -0,0 +1,81 @@
+import keras.initializers
+import keras.layers
+import tensorflow
+
+
+class QuantizedResidual(keras.layers.Layer):
+    """
+    Adds a residual branch to its shortcut and applies a ReLU, fake quantizing both inputs and the output.
+
+    Both inputs and the output share one symmetric quantization range `[-amax, amax]` with a zero point of 0 and a
+    narrow integer range, as TensorRT’s explicit INT8 quantization requires, so exporters (e.g. ONNX for TensorRT) see
+    quantize/dequantize pairs around the addition and can keep the whole Conv+Add+ReLU in INT8.
+
+    The range is either given (e.g. from an offline calibration) or calibrated from data with
+    `keras_resnet.models.ResNet1D.calibrate_residuals`. The fake quantization is always part of the graph, so the range
+    has to be set before the layer is trained or exported.
+
+    :param amax: largest absolute value of the quantization range, calibrated from data if `None`
+
+    :param num_bits: bit width of the quantization
+    """
+
+    def __init__(self, amax=None, num_bits=8, *args, **kwargs):
+        self.amax = amax
+        self.num_bits = num_bits
+
+        # while calibrating, calls record the largest absolute value and pass values through
+        self.calibrating = False
+
+        super(QuantizedResidual, self).__init__(*args, **kwargs)
+
+    def build(self, input_shape):
+        self.amax_value = self.add_weight(
+            name="amax",
+            shape=(),
+            initializer=keras.initializers.Constant(self.amax or 0.0),
+            trainable=False
+        )
+
+        super(QuantizedResidual, self).build(input_shape)
+
+    def call(self, inputs, *args, **kwargs):
+        if self.calibrating:
+            y, shortcut = inputs
+
+            outputs = tensorflow.nn.relu(y + shortcut)
+
+            self._calibrate([y, shortcut, outputs])
+
+            return outputs
+
+        y, shortcut = [self._fake_quant(x) for x in inputs]
+
+        return self._fake_quant(tensorflow.nn.relu(y + shortcut))
+
+    def compute_output_shape(self, input_shape):
+        return input_shape[0]
+
+    def get_config(self):
+        config = super(QuantizedResidual, self).get_config()
+
+        config.update({
+            "amax": self.amax,
+            "num_bits": self.num_bits
+        })
+
+        return config
+
+    def _calibrate(self, tensors):
+        amax = tensorflow.reduce_max([tensorflow.reduce_max(tensorflow.abs(x)) for x in tensors])
+
+        self.amax_value.assign(tensorflow.maximum(self.amax_value, tensorflow.cast(amax, "float32")))
+
+    def _fake_quant(self, x):
+        return tensorflow.quantization.fake_quant_with_min_max_vars(
+            x,
+            -self.amax_value,
+            self.amax_value,
+            num_bits=self.num_bits,
+            narrow_range=True
+        )
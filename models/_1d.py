@@ -7,19 +7,33 @@ keras_resnet.models._1d
 This module implements popular one-dimensional residual models.
 """
 
+import collections
+
 import keras.backend
 import keras.layers
 import keras.models
 import keras.regularizers
+import tensorflow
 
 from .. import blocks
 from .. import layers
 
+_names = (
+    "conv1",
+    "bn_conv1",
+    "conv1_relu",
+    "pool1",
+    "pool5",
+    "fc1000"
+)
+
 
 class ResNet1D(keras.Model):
     """
     Constructs a `keras.models.Model` object using the given block count.
 
+    Requires the "channels_last" (NWC) image data format.
+
     :param inputs: input tensor (e.g. an instance of `keras.layers.Input`)
 
     :param residual_blocks: the network’s residual architecture
@@ -34,6 +48,16 @@ class ResNet1D(keras.Model):
 
     :param numerical_names: list of bool, same size as blocks, used to indicate whether names of layers should include numbers or letters
 
+    :param jit_compile: if true, `compile` defaults to XLA compilation so the Conv, BatchNormalization, ReLU and Add chains of each block are fused into fewer kernels
+
+    :param identity_shortcut: if true, blocks use an identity shortcut instead of a projection wherever the stride is 1 and the feature spaces already match (not compatible with weights trained with projections)
+
+    :param separable: if true, blocks replace each kernel_size convolution with a depthwise convolution followed by a 1x1 convolution (fewer FLOPs, not compatible with weights trained without it)
+
+    :param named_layers: if false, leaves layer naming to Keras (faster to build, but weights can’t be loaded by name)
+
+    :param quantize_residuals: if true, blocks fake quantize their residual additions for INT8 export (calibrate the ranges with `calibrate_residuals` before training or exporting)
+
     :return model: ResNet model with encoding output (if `include_top=False`) or classification output (if `include_top=True`)
 
     Usage:
@@ -62,22 +86,30 @@ class ResNet1D(keras.Model):
         classes=1000,
         freeze_bn=True,
         numerical_names=None,
+        jit_compile=False,
+        identity_shortcut=False,
+        separable=False,
+        named_layers=True,
+        quantize_residuals=False,
         *args,
         **kwargs
     ):
-        if keras.backend.image_data_format() == "channels_last":
-            axis = 3
+        assert keras.backend.image_data_format() == "channels_last"
+
+        axis = -1
+
+        if named_layers:
+            names = {name: name for name in _names}
         else:
-            axis = 1
+            names = dict.fromkeys(_names)
 
         if numerical_names is None:
             numerical_names = [True] * len(residual_blocks)
 
-        x = keras.layers.ZeroPadding1D(padding=3, name="padding_conv1")(inputs)
-        x = keras.layers.Conv1D(64, (7, 7), strides=(2, 2), use_bias=False, name="conv1")(x)
-        x = layers.BatchNormalization(axis=axis, epsilon=1e-5, freeze=freeze_bn, name="bn_conv1")(x)
-        x = keras.layers.Activation("relu", name="conv1_relu")(x)
-        x = keras.layers.MaxPooling1D((3, 3), strides=(2, 2), padding="same", name="pool1")(x)
+        x = keras.layers.Conv1D(64, 7, strides=2, use_bias=False, name=names["conv1"], padding="same")(inputs)
+        x = layers.BatchNormalization(axis=axis, epsilon=1e-5, freeze=freeze_bn, name=names["bn_conv1"])(x)
+        x = keras.layers.Activation("relu", name=names["conv1_relu"])(x)
+        x = keras.layers.MaxPooling1D(3, strides=2, padding="same", name=names["pool1"])(x)
 
         features = 64
 
@@ -90,7 +122,11 @@ class ResNet1D(keras.Model):
                     stage_id,
                     block_id,
                     numerical_name=(block_id > 0 and numerical_names[stage_id]),
-                    freeze_bn=freeze_bn
+                    freeze_bn=freeze_bn,
+                    identity_shortcut=identity_shortcut,
+                    separable=separable,
+                    named_layers=named_layers,
+                    quantize_residuals=quantize_residuals
                 )(x)
 
             features *= 2
@@ -100,14 +136,128 @@ class ResNet1D(keras.Model):
         if include_top:
             assert classes > 0
 
-            x = keras.layers.GlobalAveragePooling1D(name="pool5")(x)
-            x = keras.layers.Dense(classes, activation="softmax", name="fc1000")(x)
+            x = keras.layers.GlobalAveragePooling1D(name=names["pool5"])(x)
+            x = keras.layers.Dense(classes, activation="softmax", name=names["fc1000"])(x)
 
             super(ResNet1D, self).__init__(inputs=inputs, outputs=x, *args, **kwargs)
         else:
             # Else output each stages features
             super(ResNet1D, self).__init__(inputs=inputs, outputs=outputs, *args, **kwargs)
 
+        self._resnet_jit_compile = jit_compile
+
+    def compile(self, *args, **kwargs):
+        if self._resnet_jit_compile:
+            kwargs.setdefault("jit_compile", True)
+
+        return super(ResNet1D, self).compile(*args, **kwargs)
+
+    def calibrate_residuals(self, batches):
+        """
+        Calibrates the range of every `keras_resnet.layers.QuantizedResidual` layer (see `quantize_residuals`) to the
+        largest absolute value it sees.
+
+        The batches run in inference mode, so the BatchNormalization statistics aren’t updated.
+
+        :param batches: iterable of input batches (e.g. a `tensorflow.data.Dataset` of inputs)
+
+        Usage:
+
+            >>> import keras_resnet.models
+
+            >>> model = keras_resnet.models.ResNet1D18(keras.layers.Input((None, 8)), quantize_residuals=True)
+
+            >>> model.load_weights("weights.h5")
+
+            >>> model.calibrate_residuals(samples.batch(32))
+        """
+        residuals = [layer for layer in self.layers if isinstance(layer, layers.QuantizedResidual)]
+
+        for layer in residuals:
+            layer.amax_value.assign(0.0)
+            layer.calibrating = True
+
+        try:
+            for x in batches:
+                self(x, training=False)
+        finally:
+            for layer in residuals:
+                layer.calibrating = False
+
+    def fold_batch_normalization(self):
+        """
+        Copies the model for inference, replacing each Conv1D, BatchNormalization and ReLU triple with a single
+        `keras_resnet.layers.ConvBnRelu1D` layer.
+
+        The normalization and ReLU layers of a folded triple become identities with the same names. Normalization layers
+        that aren’t followed by a ReLU (e.g. before the residual addition) are kept.
+
+        :return model: a `keras.models.Model` with the same outputs and the folded weights
+
+        Usage:
+
+            >>> import keras_resnet.models
+
+            >>> model = keras_resnet.models.ResNet1D18(keras.layers.Input((None, 8)))
+
+            >>> model.load_weights("weights.h5")
+
+            >>> folded = model.fold_batch_normalization()
+        """
+        consumers = collections.defaultdict(list)
+
+        for layer in self.layers:
+            if not isinstance(layer, keras.layers.InputLayer):
+                for x in tensorflow.nest.flatten(layer.input):
+                    consumers[id(x)].append(layer)
+
+        folded, identities = {}, set()
+
+        for convolution in self.layers:
+            if type(convolution) is not keras.layers.Conv1D or convolution.use_bias:
+                continue
+
+            if convolution.padding not in ("same", "valid") or tuple(convolution.dilation_rate) != (1,):
+                continue
+
+            following = consumers[id(convolution.output)]
+
+            if len(following) != 1 or not isinstance(following[0], keras.layers.BatchNormalization):
+                continue
+
+            batch_normalization, = following
+
+            following = consumers[id(batch_normalization.output)]
+
+            if len(following) != 1 or not isinstance(following[0], keras.layers.Activation):
+                continue
+
+            activation, = following
+
+            if activation.get_config()["activation"] != "relu":
+                continue
+
+            folded[convolution.name] = layers.ConvBnRelu1D.from_layers(convolution, batch_normalization)
+
+            identities.update([batch_normalization.name, activation.name])
+
+        def clone(layer):
+            if layer.name in folded:
+                return folded[layer.name]
+
+            if layer.name in identities:
+                return keras.layers.Activation("linear", name=layer.name)
+
+            return layer.__class__.from_config(layer.get_config())
+
+        model = keras.models.clone_model(self, clone_function=clone)
+
+        for layer in model.layers:
+            if layer.name not in folded and layer.weights:
+                layer.set_weights(self.get_layer(layer.name).get_weights())
+
+        return model
+
 
 class ResNet1D18(ResNet1D):
     """
@@ -11,15 +11,30 @@ import keras.backend
 import keras.layers
 import keras.models
 import keras.regularizers
+import tensorflow
 
 from .. import blocks
 from .. import layers
 
+_names = (
+    "conv1",
+    "bn_conv1",
+    "conv1_relu",
+    "pool1",
+    "pool5",
+    "fc1000",
+    "fc1000_flatten",
+    "fc1000_crop",
+    "fc1000_softmax"
+)
+
 
 class ResNet2D(keras.Model):
     """
     Constructs a `keras.models.Model` object using the given block count.
 
+    Requires the "channels_last" (NHWC) image data format.
+
     :param inputs: input tensor (e.g. an instance of `keras.layers.Input`)
 
     :param residual_blocks: the network’s residual architecture
@@ -34,8 +49,24 @@ class ResNet2D(keras.Model):
 
     :param numerical_names: list of bool, same size as blocks, used to indicate whether names of layers should include numbers or letters
 
+    :param classes_multiple: if given, pads the classification layer’s units to a multiple of this value (e.g. 128 for TPU tiles) and drops the padding logits before the softmax
+
+    :param jit_compile: if true, `compile` defaults to XLA compilation so the Conv, BatchNormalization, ReLU and Add chains of each block are fused into fewer kernels
+
+    :param identity_shortcut: if true, blocks use an identity shortcut instead of a projection wherever the stride is 1 and the feature spaces already match (not compatible with weights trained with projections)
+
+    :param separable: if true, blocks replace each kernel_size convolution with a depthwise convolution followed by a 1x1 convolution (fewer FLOPs, not compatible with weights trained without it)
+
+    :param named_layers: if false, leaves layer naming to Keras (faster to build, but weights can’t be loaded by name)
+
+    :param mixed_precision: if true, builds the layers with the "mixed_float16" policy (float16 computations, float32 variables) and keeps the classification layers in float32 for numerical stability
+
+    :param convolutional_classifier: if true, computes `fc1000` as a 1x1 convolution of the pooled features instead of a dense layer (the same computation on the convolution path, its kernel is the dense kernel reshaped from `(features, classes)` to `(1, 1, features, classes)`)
+
     :return model: ResNet model with encoding output (if `include_top=False`) or classification output (if `include_top=True`)
 
+    :raises ValueError: if a layer built by a custom block uses the "channels_first" data format
+
     Usage:
 
         >>> import keras_resnet.blocks
@@ -62,50 +93,145 @@ class ResNet2D(keras.Model):
         classes=1000,
         freeze_bn=True,
         numerical_names=None,
+        classes_multiple=None,
+        jit_compile=False,
+        identity_shortcut=False,
+        separable=False,
+        named_layers=True,
+        mixed_precision=False,
+        convolutional_classifier=False,
         *args,
         **kwargs
     ):
-        if keras.backend.image_data_format() == "channels_last":
-            axis = 3
-        else:
-            axis = 1
+        assert keras.backend.image_data_format() == "channels_last"
+
+        axis = -1
+
+        if mixed_precision:
+            policy = keras.mixed_precision.global_policy()
+
+            keras.mixed_precision.set_global_policy("mixed_float16")
+
+        try:
+            if named_layers:
+                names = {name: name for name in _names}
+            else:
+                names = dict.fromkeys(_names)
+
+            if numerical_names is None:
+                numerical_names = [True] * len(residual_blocks)
+
+            x = keras.layers.Conv2D(64, (7, 7), strides=(2, 2), use_bias=False, name=names["conv1"], padding="same")(inputs)
+            if freeze_bn:
+                x = layers.FusedBatchNormalization(axis=axis, epsilon=1e-5, name=names["bn_conv1"])(x)
+            else:
+                x = layers.BatchNormalization(axis=axis, epsilon=1e-5, freeze=freeze_bn, name=names["bn_conv1"])(x)
+            x = keras.layers.Activation("relu", name=names["conv1_relu"])(x)
+            x = keras.layers.MaxPooling2D((3, 3), strides=(2, 2), padding="same", name=names["pool1"])(x)
+
+            features = 64
+
+            outputs = []
+
+            for stage_id, iterations in enumerate(residual_blocks):
+                for block_id in range(iterations):
+                    x = block(
+                        features,
+                        stage_id,
+                        block_id,
+                        numerical_name=(block_id > 0 and numerical_names[stage_id]),
+                        freeze_bn=freeze_bn,
+                        identity_shortcut=identity_shortcut,
+                        separable=separable,
+                        named_layers=named_layers
+                    )(x)
+
+                features *= 2
+
+                outputs.append(x)
+
+            if include_top:
+                assert classes > 0
+
+                if classes_multiple:
+                    units = -(-classes // classes_multiple) * classes_multiple
+                else:
+                    units = classes
+
+                # the softmax follows the crop of a padded classification layer
+                activation = "softmax" if units == classes else None
+
+                x = keras.layers.GlobalAveragePooling2D(keepdims=convolutional_classifier, dtype="float32", name=names["pool5"])(x)
+
+                if convolutional_classifier:
+                    x = keras.layers.Conv2D(units, (1, 1), activation=activation, dtype="float32", name=names["fc1000"])(x)
+                    x = keras.layers.Flatten(dtype="float32", name=names["fc1000_flatten"])(x)
+                else:
+                    x = keras.layers.Dense(units, activation=activation, dtype="float32", name=names["fc1000"])(x)
+
+                if units != classes:
+                    x = layers.Crop(classes, dtype="float32", name=names["fc1000_crop"])(x)
+                    x = keras.layers.Activation("softmax", dtype="float32", name=names["fc1000_softmax"])(x)
+
+                super(ResNet2D, self).__init__(inputs=inputs, outputs=x, *args, **kwargs)
+            else:
+                # Else output each stages features
+                super(ResNet2D, self).__init__(inputs=inputs, outputs=outputs, *args, **kwargs)
+        finally:
+            # the model keeps the mixed policy (e.g. for loss scaling), layers built afterwards don’t
+            if mixed_precision:
+                keras.mixed_precision.set_global_policy(policy)
+
+        self._assert_channels_last()
+
+        self._resnet_jit_compile = jit_compile
+
+    def _assert_channels_last(self):
+        # a single channels_first layer (e.g. from a custom block) would make TensorFlow insert layout transposes
+        for layer in self.layers:
+            data_format = getattr(layer, "data_format", "channels_last")
+
+            if data_format != "channels_last":
+                raise ValueError("{} uses the {} data format".format(layer.name, data_format))
+
+    def compile(self, *args, **kwargs):
+        if self._resnet_jit_compile:
+            kwargs.setdefault("jit_compile", True)
+
+        return super(ResNet2D, self).compile(*args, **kwargs)
+
+    def quantize(self, representative_dataset):
+        """
+        Converts the model to a fully integer (INT8) TensorFlow Lite model using post-training quantization.
+
+        :param representative_dataset: callable returning a generator that yields lists of sample inputs, used to calibrate activation ranges
+
+        :return model: serialized TensorFlow Lite model with INT8 weights, activations, inputs and outputs
 
-        if numerical_names is None:
-            numerical_names = [True] * len(residual_blocks)
+        Usage:
 
-        x = keras.layers.Conv2D(64, (7, 7), strides=(2, 2), use_bias=False, name="conv1", padding="same")(inputs)
-        x = layers.BatchNormalization(axis=axis, epsilon=1e-5, freeze=freeze_bn, name="bn_conv1")(x)
-        x = keras.layers.Activation("relu", name="conv1_relu")(x)
-        x = keras.layers.MaxPooling2D((3, 3), strides=(2, 2), padding="same", name="pool1")(x)
+            >>> import keras_resnet.models
 
-        features = 64
+            >>> model = keras_resnet.models.ResNet50(keras.layers.Input((224, 224, 3)))
 
-        outputs = []
+            >>> def representative_dataset():
+            ...     for x in samples:
+            ...         yield [x]
 
-        for stage_id, iterations in enumerate(residual_blocks):
-            for block_id in range(iterations):
-                x = block(
-                    features,
-                    stage_id,
-                    block_id,
-                    numerical_name=(block_id > 0 and numerical_names[stage_id]),
-                    freeze_bn=freeze_bn
-                )(x)
+            >>> tflite_model = model.quantize(representative_dataset)
+        """
+        converter = tensorflow.lite.TFLiteConverter.from_keras_model(self)
 
-            features *= 2
+        converter.optimizations = [tensorflow.lite.Optimize.DEFAULT]
 
-            outputs.append(x)
+        converter.representative_dataset = representative_dataset
 
-        if include_top:
-            assert classes > 0
+        converter.target_spec.supported_ops = [tensorflow.lite.OpsSet.TFLITE_BUILTINS_INT8]
 
-            x = keras.layers.GlobalAveragePooling2D(name="pool5")(x)
-            x = keras.layers.Dense(classes, activation="softmax", name="fc1000")(x)
+        converter.inference_input_type = tensorflow.int8
+        converter.inference_output_type = tensorflow.int8
 
-            super(ResNet2D, self).__init__(inputs=inputs, outputs=x, *args, **kwargs)
-        else:
-            # Else output each stages features
-            super(ResNet2D, self).__init__(inputs=inputs, outputs=outputs, *args, **kwargs)
+        return converter.convert()
 
 
 class ResNet2D18(ResNet2D):
@@ -26,10 +26,9 @@ class FPN2D(keras.Model):
             *args,
             **kwargs
     ):
-        if keras.backend.image_data_format() == "channels_last":
-            axis = 3
-        else:
-            axis = 1
+        assert keras.backend.image_data_format() == "channels_last"
+
+        axis = -1
 
         if numerical_names is None:
             numerical_names = [True] * len(blocks)
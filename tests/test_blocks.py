@@ -0,0 +1,44 @@
+import keras
+import pytest
+
+import keras_resnet.blocks
+
+
+def _model(block, shape, **kwargs):
+    x = keras.layers.Input(shape)
+
+    return keras.models.Model(x, block(**kwargs)(x))
+
+
+def _layer_names(block, shape, **kwargs):
+    return [layer.name for layer in _model(block, shape, **kwargs).layers]
+
+
+@pytest.mark.parametrize("block, shape", [
+    (keras_resnet.blocks.basic_1d, (None, 64)),
+    (keras_resnet.blocks.basic_2d, (8, 8, 64))
+])
+class TestIdentityShortcut:
+    def test_skips_projection_when_widths_match(self, block, shape):
+        assert "res2a_branch1" not in _layer_names(block, shape, filters=64, identity_shortcut=True)
+
+    def test_keeps_projection_by_default(self, block, shape):
+        assert "res2a_branch1" in _layer_names(block, shape, filters=64)
+
+
+@pytest.mark.parametrize("block, shape", [
+    (keras_resnet.blocks.basic_1d, (16, 64)),
+    (keras_resnet.blocks.basic_2d, (8, 8, 64))
+])
+class TestSeparable:
+    def test_matches_convolution_output_shape(self, block, shape):
+        # the first block of the second stage has a stride of 2
+        expected = _model(block, shape, filters=128, stage=1).output_shape
+
+        assert _model(block, shape, filters=128, stage=1, separable=True).output_shape == expected
+
+    def test_adds_depthwise_convolutions(self, block, shape):
+        names = _layer_names(block, shape, filters=128, stage=1, separable=True)
+
+        assert "res3a_branch2a_depthwise" in names
+        assert "res3a_branch2b_depthwise" in names
@@ -0,0 +1,109 @@
+import keras
+import numpy
+import pytest
+
+import keras_resnet.layers
+
+
+def _batch_normalization_weights(channels):
+    gamma = numpy.random.uniform(0.5, 1.5, channels)
+    beta = numpy.random.uniform(-1.0, 1.0, channels)
+
+    moving_mean = numpy.random.uniform(-1.0, 1.0, channels)
+    moving_variance = numpy.random.uniform(0.5, 1.5, channels)
+
+    return [gamma, beta, moving_mean, moving_variance]
+
+
+class TestFusedBatchNormalization:
+    @pytest.mark.parametrize("shape", [(2, 16, 8), (2, 4, 4, 8)])
+    @pytest.mark.parametrize("dtype", ["float32", "mixed_float16"])
+    def test_matches_frozen_batch_normalization(self, shape, dtype):
+        x = numpy.random.normal(size=shape).astype("float32")
+
+        weights = _batch_normalization_weights(shape[-1])
+
+        expected = keras_resnet.layers.BatchNormalization(axis=-1, epsilon=1e-5, freeze=True)
+        expected.build(shape)
+        expected.set_weights(weights)
+
+        # the mixed policy computes on float16 inputs while the weights stay float32
+        fused = keras_resnet.layers.FusedBatchNormalization(axis=-1, epsilon=1e-5, dtype=dtype)
+        fused.build(shape)
+        fused.set_weights(weights)
+
+        tolerance = 1e-2 if dtype == "mixed_float16" else 1e-5
+
+        numpy.testing.assert_allclose(
+            numpy.asarray(fused(x), "float32"),
+            numpy.asarray(expected(x)),
+            rtol=tolerance,
+            atol=tolerance
+        )
+
+
+class TestConvBnRelu1D:
+    @pytest.mark.parametrize("kernel_size, strides", [(1, 1), (3, 1), (3, 2)])
+    def test_matches_convolution_batch_normalization_relu(self, kernel_size, strides):
+        x = numpy.random.normal(size=(2, 16, 8)).astype("float32")
+
+        convolution = keras.layers.Conv1D(16, kernel_size, strides=strides, padding="same", use_bias=False)
+
+        batch_normalization = keras_resnet.layers.BatchNormalization(axis=-1, epsilon=1e-5, freeze=True)
+
+        # builds both layers before the normalization statistics are replaced
+        batch_normalization(convolution(x))
+
+        batch_normalization.set_weights(_batch_normalization_weights(16))
+
+        expected = keras.layers.Activation("relu")(batch_normalization(convolution(x)))
+
+        layer = keras_resnet.layers.ConvBnRelu1D.from_layers(convolution, batch_normalization)
+
+        numpy.testing.assert_allclose(numpy.asarray(layer(x)), numpy.asarray(expected), rtol=1e-4, atol=1e-4)
+
+    @pytest.mark.parametrize("kwargs", [{"padding": "causal"}, {"dilation_rate": 2}])
+    def test_rejects_unfoldable_convolutions(self, kwargs):
+        convolution = keras.layers.Conv1D(16, 3, use_bias=False, **kwargs)
+
+        batch_normalization = keras_resnet.layers.BatchNormalization(axis=-1, epsilon=1e-5, freeze=True)
+
+        batch_normalization(convolution(numpy.zeros((2, 16, 8), "float32")))
+
+        with pytest.raises(AssertionError):
+            keras_resnet.layers.ConvBnRelu1D.from_layers(convolution, batch_normalization)
+
+
+class TestQuantizedResidual:
+    def test_matches_addition_relu_inside_range(self):
+        a = numpy.random.uniform(-1.0, 1.0, (2, 16, 8)).astype("float32")
+        b = numpy.random.uniform(-1.0, 1.0, (2, 16, 8)).astype("float32")
+
+        layer = keras_resnet.layers.QuantizedResidual(4.0)
+
+        # a narrow symmetric range has 2 ** num_bits - 2 steps, each fake quantization rounds by at most half a step
+        step = 2 * 4.0 / (2 ** layer.num_bits - 2)
+
+        numpy.testing.assert_allclose(numpy.asarray(layer([a, b])), numpy.maximum(a + b, 0.0), rtol=0, atol=1.5 * step + 1e-6)
+
+    def test_calibrates_range(self):
+        a = numpy.random.uniform(-1.0, 1.0, (2, 16, 8)).astype("float32")
+        b = numpy.random.uniform(-1.0, 1.0, (2, 16, 8)).astype("float32")
+
+        expected = numpy.maximum(a + b, 0.0)
+
+        layer = keras_resnet.layers.QuantizedResidual()
+
+        layer.calibrating = True
+
+        numpy.testing.assert_allclose(numpy.asarray(layer([a, b])), expected, rtol=1e-6, atol=1e-6)
+
+        amax = max(numpy.abs(a).max(), numpy.abs(b).max(), expected.max())
+
+        numpy.testing.assert_allclose(layer.amax_value.numpy(), amax, rtol=1e-6)
+
+        layer.calibrating = False
+
+        step = 2 * amax / (2 ** layer.num_bits - 2)
+
+        numpy.testing.assert_allclose(numpy.asarray(layer([a, b])), expected, rtol=0, atol=1.5 * step + 1e-6)
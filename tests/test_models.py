@@ -0,0 +1,151 @@
+import keras
+import numpy
+import pytest
+
+import keras_resnet.blocks
+import keras_resnet.layers
+import keras_resnet.models
+
+
+class TestResNet1D:
+    def test_builds(self):
+        x = keras.layers.Input((None, 8))
+
+        model = keras_resnet.models.ResNet1D18(x, classes=10)
+
+        assert model.output_shape == (None, 10)
+
+    def test_warns_on_unaligned_widths(self):
+        def block(features, *args, **kwargs):
+            return keras_resnet.blocks.basic_1d(features - 4, *args, **kwargs)
+
+        with pytest.warns(UserWarning, match="not a multiple of 8"):
+            keras_resnet.models.ResNet1D(keras.layers.Input((None, 8)), [1], block, classes=10)
+
+    def test_calibrate_residuals(self):
+        model = keras_resnet.models.ResNet1D18(keras.layers.Input((None, 8)), classes=10, quantize_residuals=True)
+
+        moving_mean = model.get_layer("bn_conv1").moving_mean.numpy()
+
+        model.calibrate_residuals([numpy.random.normal(size=(2, 64, 8)).astype("float32")])
+
+        residuals = [layer for layer in model.layers if isinstance(layer, keras_resnet.layers.QuantizedResidual)]
+
+        assert len(residuals) == 8
+
+        assert all(layer.amax_value.numpy() > 0 for layer in residuals)
+
+        numpy.testing.assert_array_equal(model.get_layer("bn_conv1").moving_mean.numpy(), moving_mean)
+
+    def test_fold_batch_normalization(self):
+        x = keras.layers.Input((None, 8))
+
+        model = keras_resnet.models.ResNet1D18(x, include_top=False)
+
+        for layer in model.layers:
+            if isinstance(layer, keras.layers.BatchNormalization):
+                layer.set_weights([numpy.random.uniform(0.5, 1.5, weight.shape) for weight in layer.get_weights()])
+
+        folded = model.fold_batch_normalization()
+
+        # the stem and the first convolution of each of the eight blocks
+        assert sum(isinstance(layer, keras_resnet.layers.ConvBnRelu1D) for layer in folded.layers) == 9
+
+        x = numpy.random.normal(size=(2, 64, 8)).astype("float32")
+
+        for expected, actual in zip(model(x, training=False), folded(x, training=False)):
+            numpy.testing.assert_allclose(numpy.asarray(actual), numpy.asarray(expected), rtol=1e-4, atol=1e-4)
+
+
+class TestResNet2D:
+    def test_pads_classifier_to_multiple(self):
+        x = keras.layers.Input((32, 32, 3))
+
+        model = keras_resnet.models.ResNet2D18(x, classes=10, classes_multiple=8)
+
+        assert model.get_layer("fc1000").output_shape[-1] == 16
+
+        assert model.output_shape == (None, 10)
+
+    def test_convolutional_classifier_matches_dense(self):
+        # a padded classification layer has no activation, so fc1000 outputs the logits
+        dense = keras_resnet.models.ResNet2D18(keras.layers.Input((32, 32, 3)), classes=10, classes_multiple=8)
+
+        convolutional = keras_resnet.models.ResNet2D18(
+            keras.layers.Input((32, 32, 3)),
+            classes=10,
+            classes_multiple=8,
+            convolutional_classifier=True
+        )
+
+        for layer in dense.layers:
+            weights = layer.get_weights()
+
+            if layer.name == "fc1000":
+                kernel, bias = weights
+
+                weights = [kernel.reshape((1, 1) + kernel.shape), bias]
+
+            if weights:
+                convolutional.get_layer(layer.name).set_weights(weights)
+
+        x = numpy.random.normal(size=(2, 32, 32, 3)).astype("float32")
+
+        for model in (dense, convolutional):
+            assert model.get_layer("fc1000").count_params() == 512 * 16 + 16
+
+        dense_logits, convolutional_logits = [
+            keras.models.Model(model.input, model.get_layer("fc1000").output)(x, training=False)
+            for model in (dense, convolutional)
+        ]
+
+        numpy.testing.assert_allclose(
+            numpy.reshape(convolutional_logits, (2, -1)),
+            numpy.asarray(dense_logits),
+            rtol=1e-4,
+            atol=1e-4
+        )
+
+    def test_rejects_channels_first_layers(self):
+        def block(features, stage_id, block_id, **kwargs):
+            return keras.layers.MaxPooling2D(1, data_format="channels_first")
+
+        with pytest.raises(ValueError, match="channels_first"):
+            keras_resnet.models.ResNet2D(keras.layers.Input((32, 32, 3)), [1], block, classes=10)
+
+    def test_mixed_precision(self):
+        x = keras.layers.Input((32, 32, 3))
+
+        model = keras_resnet.models.ResNet2D18(x, classes=10, classes_multiple=8, mixed_precision=True)
+
+        assert model.get_layer("conv1").compute_dtype == "float16"
+
+        for name in ("pool5", "fc1000", "fc1000_softmax"):
+            assert model.get_layer(name).output.dtype == "float32"
+
+        assert keras.mixed_precision.global_policy().name == "float32"
+
+    def test_mixed_precision_restores_policy_on_failure(self):
+        x = keras.layers.Input((32, 32, 3))
+
+        with pytest.raises(AssertionError):
+            keras_resnet.models.ResNet2D18(x, classes=0, mixed_precision=True)
+
+        assert keras.mixed_precision.global_policy().name == "float32"
+
+
+@pytest.mark.parametrize("model, shape", [
+    (keras_resnet.models.ResNet1D18, (None, 8)),
+    (keras_resnet.models.ResNet2D18, (32, 32, 3))
+])
+class TestNamedLayers:
+    def test_builds_without_names(self, model, shape):
+        expected = model(keras.layers.Input(shape), classes=10)
+
+        unnamed = model(keras.layers.Input(shape), classes=10, named_layers=False)
+
+        assert not any(layer.name.startswith(("res", "bn")) for layer in unnamed.layers)
+
+        assert len(unnamed.weights) == len(expected.weights)
+
+        assert unnamed.count_params() == expected.count_params()